@@ -11,6 +11,11 @@ from typing import List, Dict, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from config.default_config import DEFAULT_CONFIG, get_api_headers, API_ENDPOINTS
 
+try:
+    import orjson  # Parser JSON más rápido para respuestas grandes (day-summaries)
+except ImportError:
+    orjson = None
+
 
 class HumanApiClient:
     """Cliente para interactuar con la API de Human.co"""
@@ -319,7 +324,7 @@ class HumanApiClient:
                     raise ValueError(f"Método HTTP no soportado: {method}")
                 
                 response.raise_for_status()
-                return response.json()
+                return self._parse_json(response)
                 
             except requests.exceptions.RequestException as e:
                 print(f"⚠️ Intento {attempt + 1}/{self.max_retries} falló: {str(e)}")
@@ -332,6 +337,18 @@ class HumanApiClient:
         
         return None
     
+    def _parse_json(self, response: requests.Response):
+        """
+        Decodifica el cuerpo JSON de la respuesta, con orjson si está disponible.
+        Si orjson no puede (p.ej. otra codificación), se usa response.json() normal.
+        """
+        if orjson is not None:
+            try:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                pass
+        return response.json()
+    
     def _split_date_range(self, start_date: str, end_date: str, max_days: int = 30) -> List[Dict]:
         """
         Divide un rango de fechas en chunks más pequeños
@@ -1,22 +1,285 @@
 """
-Generador de archivos Excel usando Pandas
+Generador de archivos Excel
+Escribe el XLSX directamente (XML en streaming dentro del zip), sin librerías de Excel
 Solo muestra los datos calculados por hours_calculator
 """
 
+import io
 import os
-import pandas as pd
+import zipfile
+from operator import itemgetter
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Iterator, List, Sequence, Tuple
+from xml.sax.saxutils import escape
+from openpyxl.utils import get_column_letter
 from config.default_config import DEFAULT_CONFIG
 import re 
 
 
+# -------------------- Partes fijas del paquete XLSX --------------------
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{sheets}'
+    '</Types>'
+)
+_CONTENT_TYPE_SHEET = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets>'
+    '</workbook>'
+)
+_WORKBOOK_SHEET = '<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>'
+
+_WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}'
+    '<Relationship Id="rId{styles_id}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_RELS_SHEET = (
+    '<Relationship Id="rId{n}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{n}.xml"/>'
+)
+
+# Estilos: el índice de cada <xf> en cellXfs es el valor del atributo s="" de las celdas
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="{num_format}"/></numFmts>'
+    '<fonts count="3">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="12"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="8">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF366092"/><bgColor indexed="64"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFD4EDDA"/><bgColor indexed="64"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFFFF3CD"/><bgColor indexed="64"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFF8D7DA"/><bgColor indexed="64"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFD1ECF1"/><bgColor indexed="64"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFD6EAF8"/><bgColor indexed="64"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="2">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"><color auto="1"/></left><right style="thin"><color auto="1"/></right>'
+    '<top style="thin"><color auto="1"/></top><bottom style="thin"><color auto="1"/></bottom><diagonal/></border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="9">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="0" fontId="2" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="3" borderId="1" xfId="0" applyNumberFormat="1" applyFill="1" applyBorder="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="4" borderId="1" xfId="0" applyNumberFormat="1" applyFill="1" applyBorder="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="5" borderId="1" xfId="0" applyNumberFormat="1" applyFill="1" applyBorder="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="6" borderId="1" xfId="0" applyNumberFormat="1" applyFill="1" applyBorder="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="7" borderId="1" xfId="0" applyNumberFormat="1" applyFill="1" applyBorder="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_HEAD_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+)
+_SHEET_TAIL_XML = '</sheetData></worksheet>'
+
+
+def _col_width_xml(width: float) -> str:
+    """
+    Ancho de columna (en caracteres) tal como lo escribía xlsxwriter en <col width>:
+    agrega el padding de la fuente Calibri 11 (dígito de 7px + 5px) y redondea a 1/256.
+    """
+    if width <= 0:
+        return '0'
+    if width < 1:
+        px = int(width * 12 + 0.5)
+    else:
+        px = int(width * 7 + 0.5) + 5
+    return f"{int(px / 7.0 * 256.0) / 256.0:.16g}"
+
+
+# Caracteres de control prohibidos en XML 1.0 y literales "_xHHHH_" ya existentes
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b-\x1f\ufffe\uffff]')
+_X_ESCAPE_RE = re.compile(r'(_x[0-9a-fA-F]{4}_)')
+_NEEDS_X_ESCAPE_RE = re.compile(r'[\x00-\x08\x0b-\x1f\ufffe\uffff]|_x[0-9a-fA-F]{4}_')
+
+
+def _xml_text(value: str) -> str:
+    """
+    Escapa un texto para <t>: escape() más la codificación _xHHHH_ de Excel para
+    caracteres de control (igual que xlsxwriter; "_x000B_" literal → "_x005F_x000B_").
+    """
+    if _NEEDS_X_ESCAPE_RE.search(value):  # casi nunca: nombres y fechas comunes no pasan por acá
+        value = _X_ESCAPE_RE.sub(r'_x005F\1', value)
+        value = _CONTROL_CHARS_RE.sub(lambda m: f'_x{ord(m.group()):04X}_', value)
+    return escape(value)
+
+
+# Hora HH:MM dentro de las fichadas ("YYYY-MM-DD HH:MM")
+_HHMM_RE = re.compile(r'([01]\d|2[0-3]):[0-5]\d')
+
+# Claves de daily_data para las columnas de horas de DAILY_COLUMNS (mismo orden)
+_DAILY_HOUR_KEYS = (
+    'hours_worked',
+    'regular_hours',
+    'night_hours',
+    #'extra_hours',
+    #'extra_hours_day',
+    #'extra_hours_night',
+    'extra_night_hours_50',
+    'extra_hours_50',
+    'extra_night_hours_100',
+    'extra_hours_100',
+    #'extra_hours_150',
+    'holiday_hours',
+    'holiday_night_hours',
+)
+# hours_calculator siempre completa estas claves en cada día, así que se leen
+# todas juntas (en C) sin defaults
+_daily_hours = itemgetter(*_DAILY_HOUR_KEYS)
+
+# -------------------- Columnas de cada hoja --------------------
+# Las filas generadas por _prepare_*_data respetan este mismo orden
+
+SUMMARY_COLUMNS = (
+    'ID Empleado',
+    'Nombre',
+    'Apellido',
+    'Total Horas',
+    'Horas Regulares',
+    'Horas Extra 50%',
+    'Horas Extra 100%',
+    'Horas Nocturnas',
+    'Horas Feriado',
+    'Horas Feriado Nocturnas',
+    #'Total Tardanzas',
+    #'Total Retiros Anticipados',
+    'Horas Extra Diurnas',
+    'Horas Extra Nocturnas',
+    'Horas Extra 50% Nocturnas',
+    'Horas Extra 100% Nocturnas',
+)
+
+DAILY_COLUMNS = (
+    'Legajo',
+    'Apellido, Nombre',
+    'Fecha',
+    'Horario obligatorio',
+    'Fichadas',
+    'Observaciones',
+    'Horas Trabajadas',
+    'Horas Regulares',
+    'Horas Nocturnas',
+    #'Horas extra',
+    #'Horas Extra Diurnas',
+    #'Horas Extra Nocturnas',
+    'Horas Extra 50% Nocturnas',
+    'Horas Extra 50%',
+    'Horas Extra 100% Nocturnas',
+    'Horas Extra 100%',
+    #'Horas Extra 150%',
+    'Horas Feriado',
+    'Horas Feriado Nocturnas',
+    #'Es Franco',
+    #'Es Feriado',
+    #'Nombre Feriado',
+    #'Tiene Licencia',
+    #'Tipo Licencia',
+    #'Tardanza',
+    #'Retiro Anticipado',
+)
+
+
 class ExcelReportGenerator:
+    # Índices de estilo (posición en cellXfs de _STYLES_XML)
+    STYLE_DEFAULT = 0
+    STYLE_TITLE = 1
+    STYLE_HEADER = 2
+    STYLE_TIME = 3
+    STYLE_REGULAR = 4
+    STYLE_EXTRA_50 = 5
+    STYLE_EXTRA_100 = 6
+    STYLE_NIGHT = 7
+    STYLE_HOLIDAY = 8
+
+    # (ancho, estilo) por columna; las que no figuran usan el formato por defecto de la hoja
+    SUMMARY_COL_STYLES = {
+        'Total Horas': (16, STYLE_TIME),
+        'Horas Regulares': (16, STYLE_REGULAR),
+        'Horas Extra 50%': (16, STYLE_EXTRA_50),
+        'Horas Extra 100%': (16, STYLE_EXTRA_100),
+        'Horas Nocturnas': (16, STYLE_NIGHT),
+        'Horas Feriado': (16, STYLE_HOLIDAY),
+        'Horas Feriado Nocturnas': (16, STYLE_HOLIDAY),
+        'Total Tardanzas': (16, STYLE_TIME),
+        'Total Retiros Anticipados': (16, STYLE_TIME),
+        'Horas Extra Diurnas': (16, STYLE_TIME),
+        'Horas Extra Nocturnas': (16, STYLE_NIGHT),
+        'Horas Extra 50% Nocturnas': (16, STYLE_TIME),
+        'Horas Extra 100% Nocturnas': (16, STYLE_TIME),
+    }
+
+    DAILY_COL_STYLES = {
+        'Apellido, Nombre': (28, STYLE_DEFAULT),
+        'Fecha': (20, STYLE_DEFAULT),
+        'Nombre Feriado': (20, STYLE_DEFAULT),
+        'Observaciones': (20, STYLE_DEFAULT),
+        'Horas Trabajadas': (12, STYLE_TIME),
+        'Horas Regulares': (12, STYLE_TIME),
+        'Horas Extra 50%': (12, STYLE_TIME),
+        'Horas Extra 100%': (12, STYLE_TIME),
+        'Horas Nocturnas': (12, STYLE_TIME),
+        'Horas Feriado': (12, STYLE_TIME),
+        'Horas Feriado Nocturnas': (12, STYLE_TIME),
+        'Horas extra': (12, STYLE_TIME),
+        'Tardanza': (12, STYLE_TIME),
+        'Retiro Anticipado': (12, STYLE_TIME),
+        'Horas Extra Diurnas': (12, STYLE_TIME),
+        'Horas Extra Nocturnas': (12, STYLE_TIME),
+        'Horas Extra 50% Nocturnas': (12, STYLE_TIME),
+        'Horas Extra 100% Nocturnas': (12, STYLE_TIME),
+    }
+
     def __init__(self):
         self.output_dir = os.path.expanduser(DEFAULT_CONFIG['output_directory'])
         self.filename_format = DEFAULT_CONFIG['filename_format']
         # Flag para controlar si las horas se muestran en decimales o como tiempo Excel (hh:mm)
         self.usar_decimales = DEFAULT_CONFIG.get('usar_decimales_en_excel', False)
+        # Formato numérico según config
+        self.num_format = '0.00' if self.usar_decimales else 'hh:mm'
+        # Valor a mostrar para 0 horas ('-' si está activada la opción visual)
+        self.zero_value = "-" if DEFAULT_CONFIG.get("mostrar_ceros_como_guion", False) else 0.0
+        # Estilos / formato de columnas: se arman en el primer reporte (ver _get_formats)
+        self._formats = None
+        # Último directorio de salida ya creado (evita os.makedirs en cada reporte)
+        self._dir_ready = None
 
     # -------------------- Helpers --------------------
 
@@ -25,227 +288,241 @@ class ExcelReportGenerator:
         Devuelve las horas en el formato configurado.
         Si mostrar_ceros_como_guion=True, los 0.00 u 00:00 se muestran como '-'
         """
-        try:
-            value = float(hours) if hours else 0.0
-
-            # Si el valor es 0 y está activada la opción visual
-            if value == 0 and DEFAULT_CONFIG.get("mostrar_ceros_como_guion", False):
-                return "-"  
-
-            if self.usar_decimales:
-                return round(value, 2)
-            return round(value / 24.0, 10)
-        except Exception:
-            return "-"
+        # La mayoría de las celdas son 0 (francos, días sin extras)
+        if not hours:
+            return self.zero_value
 
+        if self.usar_decimales:
+            return round(hours, 2)
+        return hours / 24.0
 
-    def _only_hhmm(self, value) -> str:
+    def _only_hhmm(self, value: str) -> str:
         """Devuelve 'HH:MM' si lo encuentra dentro de value; si no, ''."""
-        if not value:
-            return ""
-        m = re.search(r'([01]\d|2[0-3]):[0-5]\d', str(value))
+        m = _HHMM_RE.search(value) if value else None
         return m.group(0) if m else ""
 
     # -------------------- Generación principal --------------------
     def generate_report(self, processed_data: Dict, start_date: str, end_date: str, output_filename: str = None) -> str:
-        """Genera el reporte Excel usando pandas"""
-
-        summary_data = self._prepare_summary_data(processed_data)
-        daily_data = self._prepare_daily_data(processed_data)
+        """Genera el reporte Excel escribiendo el XML de cada hoja en streaming"""
 
         if not output_filename:
             output_filename = self.filename_format.format(
                 start_date=start_date.replace('-', ''), end_date=end_date.replace('-', '')
             )
 
-        os.makedirs(self.output_dir, exist_ok=True)
+        if self._dir_ready != self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._dir_ready = self.output_dir
         filepath = os.path.join(self.output_dir, output_filename)
 
-        with pd.ExcelWriter(filepath, engine='xlsxwriter') as writer:
-            # Hoja Resumen
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Resumen Consolidado', index=False, startrow=3)
-            self._format_summary_sheet(writer, summary_df, start_date, end_date)
+        sheet_names = ['Resumen Consolidado', 'Detalle Diario']
+        formats = self._get_formats()
 
-            # Hoja Detalle Diario
-            daily_df = pd.DataFrame(daily_data)
-            daily_df.to_excel(writer, sheet_name='Detalle Diario', index=False, startrow=3)
-            self._format_daily_sheet(writer, daily_df, start_date, end_date)
+        # Textos del encabezado, comunes a todas las hojas
+        period_str = f"Período: {start_date} al {end_date}"
+        generated_str = f"Generado: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
 
-            # Hoja Configuración
+        # Las filas se generan mientras se escribe: se arma un archivo temporal y recién
+        # al terminar reemplaza a filepath, así un error no deja un .xlsx a medio escribir
+        # (ni pisa un reporte anterior con el mismo nombre)
+        tmp_path = filepath + '.tmp'
+        try:
+            with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+                self._write_workbook_xml(zf, sheet_names, formats['styles_xml'])
+
+                # Hoja Resumen
+                self._write_sheet_xml(
+                    zf, 1, ("REPORTE DE ASISTENCIA - RESUMEN CONSOLIDADO", period_str, generated_str),
+                    SUMMARY_COLUMNS, self._prepare_summary_data(processed_data),
+                    formats['summary'],
+                )
+
+                # Hoja Detalle Diario
+                self._write_sheet_xml(
+                    zf, 2, ("DETALLE DIARIO DE ASISTENCIA", period_str, generated_str),
+                    DAILY_COLUMNS, self._prepare_daily_data(processed_data),
+                    formats['daily'],
+                )
+
+                # Hoja Configuración
+
+            os.replace(tmp_path, filepath)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
         print(f"✅ Reporte Excel generado: {filepath}")
         return filepath
 
     # -------------------- Preparación de datos --------------------
-    def _prepare_summary_data(self, processed_data: Dict) -> list:
-        """Prepara datos para la hoja de resumen (horas convertidas según configuración)"""
-        summary_rows = []
-
+    def _prepare_summary_data(self, processed_data: Dict) -> Iterator[tuple]:
+        """
+        Genera las filas de la hoja de resumen (horas convertidas según configuración),
+        como tuplas en el orden de SUMMARY_COLUMNS
+        """
         for emp in processed_data.values():
             info = emp['employee_info']
             totals = emp['totals']
 
-            row = {
-                'ID Empleado': info.get('employeeInternalId', ''),
-                'Nombre': info.get('firstName', ''),
-                'Apellido': info.get('lastName', ''),
-                'Total Horas': self.hours_to_excel_time(totals.get('total_hours_worked', 0.0)),
-                'Horas Regulares': self.hours_to_excel_time(totals.get('total_regular_hours', 0.0)),
-                'Horas Extra 50%': self.hours_to_excel_time(totals.get('total_extra_hours_50', 0.0)),
-                'Horas Extra 100%': self.hours_to_excel_time(totals.get('total_extra_hours_100', 0.0)),
-                'Horas Nocturnas': self.hours_to_excel_time(totals.get('total_night_hours', 0.0)),
-                'Horas Feriado': self.hours_to_excel_time(totals.get('total_holiday_hours', 0.0)),
-                'Horas Feriado Nocturnas': self.hours_to_excel_time(totals.get('total_holiday_night_hours', 0.0)),
-                #'Total Tardanzas': self.hours_to_excel_time(totals.get('total_tardanza_horas', 0.0)),
-                #'Total Retiros Anticipados': self.hours_to_excel_time(totals.get('total_retiro_anticipado_horas', 0.0)),
-                'Horas Extra Diurnas': self.hours_to_excel_time(totals.get('total_extra_day_hours', 0.0)),
-                'Horas Extra Nocturnas': self.hours_to_excel_time(totals.get('total_extra_night_hours', 0.0)),
-                'Horas Extra 50% Nocturnas': self.hours_to_excel_time(totals.get('total_extra_night_hours_50', 0.0)),
-                'Horas Extra 100% Nocturnas': self.hours_to_excel_time(totals.get('total_extra_night_hours_100', 0.0)),
-            }
-            summary_rows.append(row)
-
-        return summary_rows
-
-    def _prepare_daily_data(self, processed_data: Dict) -> list:
-        """Prepara datos para la hoja de detalle diario"""
-        daily_rows = []
+            yield (
+                info.get('employeeInternalId', ''),
+                info.get('firstName', ''),
+                info.get('lastName', ''),
+                self.hours_to_excel_time(totals.get('total_hours_worked', 0.0)),
+                self.hours_to_excel_time(totals.get('total_regular_hours', 0.0)),
+                self.hours_to_excel_time(totals.get('total_extra_hours_50', 0.0)),
+                self.hours_to_excel_time(totals.get('total_extra_hours_100', 0.0)),
+                self.hours_to_excel_time(totals.get('total_night_hours', 0.0)),
+                self.hours_to_excel_time(totals.get('total_holiday_hours', 0.0)),
+                self.hours_to_excel_time(totals.get('total_holiday_night_hours', 0.0)),
+                #self.hours_to_excel_time(totals.get('total_tardanza_horas', 0.0)),
+                #self.hours_to_excel_time(totals.get('total_retiro_anticipado_horas', 0.0)),
+                self.hours_to_excel_time(totals.get('total_extra_day_hours', 0.0)),
+                self.hours_to_excel_time(totals.get('total_extra_night_hours', 0.0)),
+                self.hours_to_excel_time(totals.get('total_extra_night_hours_50', 0.0)),
+                self.hours_to_excel_time(totals.get('total_extra_night_hours_100', 0.0)),
+            )
 
+    def _prepare_daily_data(self, processed_data: Dict) -> Iterator[tuple]:
+        """Genera las filas de la hoja de detalle diario, en el orden de DAILY_COLUMNS"""
+        to_excel = self.hours_to_excel_time
         for emp in processed_data.values():
             info = emp['employee_info']
+            days = emp['daily_data']
+            if not days:
+                continue
 
-            for d in emp['daily_data']:
-                observations = []
+            # Datos fijos del empleado: se arman una vez, no por día
+            legajo = info.get('employeeInternalId', '')
+            full_name = f"{info.get('lastName', '')}, {info.get('firstName', '')}"
+
+            for d in days:
+                # La mayoría de los días no tiene observaciones: sin lista ni join
+                obs = ''
                 if d.get('is_holiday'):
-                    observations.append(f"Feriado: {d.get('holiday_name') or 'N/A'}")
+                    obs = 'Feriado: ' + (d.get('holiday_name') or 'N/A')
                 if d.get('has_time_off'):
-                    observations.append(f"Licencia: {d.get('time_off_name') or 'N/A'}")
+                    obs = (obs + ', ' if obs else '') + 'Licencia: ' + (d.get('time_off_name') or 'N/A')
                 if d.get('has_absence'):
-                    observations.append("AUSENCIA SIN AVISO")
-
-                row = {
-                    'Legajo': info.get('employeeInternalId', ''),
-                    'Apellido, Nombre': f"{info.get('lastName', '')}, {info.get('firstName', '')}",
-                    'Fecha': f"{d.get('day_of_week', '')} {d.get('date', '')}",
-                    'Horario obligatorio': d.get('time_range'),
-                    'Fichadas': f"{self._only_hhmm(d.get('shift_start', ''))} - {self._only_hhmm(d.get('shift_end', ''))}",
-                    'Observaciones': ', '.join(observations) if observations else '',
-                    
-                    
-                    'Horas Trabajadas': self.hours_to_excel_time(d.get('hours_worked', 0.0)),
-                    'Horas Regulares': self.hours_to_excel_time(d.get('regular_hours', 0.0)),
-                    'Horas Nocturnas': self.hours_to_excel_time(d.get('night_hours', 0.0)),
-
-
-                    #'Horas extra': self.hours_to_excel_time(d.get('extra_hours', 0.0)),
-                    #'Horas Extra Diurnas': self.hours_to_excel_time(d.get('extra_hours_day', 0.0)),
-                    #'Horas Extra Nocturnas': self.hours_to_excel_time(d.get('extra_hours_night', 0.0)),
-                    'Horas Extra 50% Nocturnas': self.hours_to_excel_time(d.get('extra_night_hours_50', 0.0)),
-                    'Horas Extra 50%': self.hours_to_excel_time(d.get('extra_hours_50', 0.0)),
-                    
-                    'Horas Extra 100% Nocturnas': self.hours_to_excel_time(d.get('extra_night_hours_100', 0.0)),
-                    'Horas Extra 100%': self.hours_to_excel_time(d.get('extra_hours_100', 0.0)),
-                    #'Horas Extra 150%': self.hours_to_excel_time(d.get('extra_hours_150', 0.0)),
-                    'Horas Feriado': self.hours_to_excel_time(d.get('holiday_hours', 0.0)),
-                    'Horas Feriado Nocturnas': self.hours_to_excel_time(d.get('holiday_night_hours', 0.0)),
-                    #'Es Franco': 'Sí' if d.get('is_rest_day') else 'No',
-                    #'Es Feriado': 'Sí' if d.get('is_holiday') else 'No',
-                    #'Nombre Feriado': d.get('holiday_name') or '',
-                    #'Tiene Licencia': 'Sí' if d.get('has_time_off') else 'No',
-                    #'Tipo Licencia': d.get('time_off_name') or '',
-                    #'Tardanza': self.hours_to_excel_time(d.get('tardanza_horas', 0.0)),
-                    #'Retiro Anticipado': self.hours_to_excel_time(d.get('retiro_anticipado_horas', 0.0)),
-                }
-                daily_rows.append(row)
-
-        return daily_rows
+                    obs = (obs + ', ' if obs else '') + 'AUSENCIA SIN AVISO'
+
+                yield (
+                    legajo,
+                    full_name,
+                    f"{d.get('day_of_week', '')} {d.get('date', '')}",
+                    d.get('time_range'),
+                    f"{self._only_hhmm(d.get('shift_start', ''))} - {self._only_hhmm(d.get('shift_end', ''))}",
+                    obs,
+                    *[to_excel(v) for v in _daily_hours(d)],
+                    #'Sí' if d.get('is_rest_day') else 'No',
+                    #'Sí' if d.get('is_holiday') else 'No',
+                    #d.get('holiday_name') or '',
+                    #'Sí' if d.get('has_time_off') else 'No',
+                    #d.get('time_off_name') or '',
+                    #self.hours_to_excel_time(d.get('tardanza_horas', 0.0)),
+                    #self.hours_to_excel_time(d.get('retiro_anticipado_horas', 0.0)),
+                )
+
+    # -------------------- Escritura XLSX --------------------
+    def _write_workbook_xml(self, zf: zipfile.ZipFile, sheet_names: List[str], styles_xml: str):
+        """Escribe las partes fijas del paquete (tipos, relaciones, libro y estilos)"""
+        numbers = range(1, len(sheet_names) + 1)
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES_XML.format(
+            sheets=''.join(_CONTENT_TYPE_SHEET.format(n=n) for n in numbers)
+        ))
+        zf.writestr('_rels/.rels', _ROOT_RELS_XML)
+        zf.writestr('xl/workbook.xml', _WORKBOOK_XML.format(
+            sheets=''.join(
+                _WORKBOOK_SHEET.format(name=escape(name, {'"': '&quot;'}), n=n)
+                for n, name in zip(numbers, sheet_names)
+            )
+        ))
+        zf.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS_XML.format(
+            sheets=''.join(_WORKBOOK_RELS_SHEET.format(n=n) for n in numbers),
+            styles_id=len(sheet_names) + 1,
+        ))
+        zf.writestr('xl/styles.xml', styles_xml)
+
+    def _write_sheet_xml(self, zf: zipfile.ZipFile, sheet_number: int, title_rows: Sequence[str],
+                         columns: Sequence[str], rows: Iterator[tuple],
+                         col_specs: List[Tuple[int, int]]):
+        """
+        Escribe xl/worksheets/sheet{n}.xml fila por fila directamente en el zip.
+        col_specs: (ancho, índice de estilo) de cada columna de datos.
+        Los textos van como inlineStr (sin tabla de strings compartidos).
+        """
+        letters = [get_column_letter(i) for i in range(1, len(columns) + 1)]
+
+        info = zipfile.ZipInfo(f'xl/worksheets/sheet{sheet_number}.xml',
+                               date_time=datetime.now().timetuple()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+
+        with zf.open(info, 'w') as raw:
+            f = io.TextIOWrapper(raw, encoding='utf-8')
+            write = f.write
+
+            write(_SHEET_HEAD_XML)
+            if col_specs:
+                write('<cols>')
+                # Como set_column(col, col, ancho, formato): el estilo cubre toda la columna
+                for i, (width, style) in enumerate(col_specs, 1):
+                    style_attr = f' style="{style}"' if style != self.STYLE_DEFAULT else ''
+                    write(f'<col min="{i}" max="{i}" width="{_col_width_xml(width)}"{style_attr} customWidth="1"/>')
+                write('</cols>')
+            write('<sheetData>')
+
+            # Filas 1-3: título, período y fecha de generación; fila 4: encabezados
+            for r, text in enumerate(title_rows, 1):
+                write(f'<row r="{r}"><c r="A{r}" s="{self.STYLE_TITLE}" t="inlineStr">'
+                      f'<is><t xml:space="preserve">{_xml_text(text)}</t></is></c></row>')
+
+            # Encabezados en una sola escritura
+            write('<row r="4">' + ''.join(
+                f'<c r="{letter}4" s="{self.STYLE_HEADER}" t="inlineStr">'
+                f'<is><t xml:space="preserve">{_xml_text(col_name)}</t></is></c>'
+                for letter, col_name in zip(letters, columns)
+            ) + '</row>')
+
+            styles = [style for _, style in col_specs]
+            for r, values in enumerate(rows, 5):
+                write(f'<row r="{r}">')
+                for letter, style, value in zip(letters, styles, values):
+                    if value is None:
+                        continue
+                    if isinstance(value, str):
+                        if not value:
+                            continue
+                        write(f'<c r="{letter}{r}" s="{style}" t="inlineStr">'
+                              f'<is><t xml:space="preserve">{_xml_text(value)}</t></is></c>')
+                    else:
+                        write(f'<c r="{letter}{r}" s="{style}"><v>{value!r}</v></c>')
+                write('</row>')
+
+            write(_SHEET_TAIL_XML)
+            f.flush()
+            f.detach()
 
     # -------------------- Formato de hojas --------------------
-    def _format_summary_sheet(self, writer, df, start_date, end_date):
-        workbook = writer.book
-        worksheet = writer.sheets['Resumen Consolidado']
-
-        # Formato numérico según config
-        num_format = '0.00' if self.usar_decimales else 'hh:mm'
-
-        header_format = workbook.add_format({
-            'bold': True, 'font_color': 'white', 'bg_color': '#366092',
-            'border': 1, 'align': 'center', 'valign': 'vcenter'
-        })
-        title_format = workbook.add_format({'bold': True, 'font_size': 12})
-        time_format = workbook.add_format({'num_format': num_format})
-
-        regular_format = workbook.add_format({'bg_color': '#D4EDDA', 'border': 1, 'num_format': num_format})
-        extra_50_format = workbook.add_format({'bg_color': '#FFF3CD', 'border': 1, 'num_format': num_format})
-        extra_100_format = workbook.add_format({'bg_color': '#F8D7DA', 'border': 1, 'num_format': num_format})
-        night_format = workbook.add_format({'bg_color': '#D1ECF1', 'border': 1, 'num_format': num_format})
-        holiday_format = workbook.add_format({'bg_color': '#D6EAF8', 'border': 1, 'num_format': num_format})
-
-        worksheet.write(0, 0, "REPORTE DE ASISTENCIA - RESUMEN CONSOLIDADO", title_format)
-        worksheet.write(1, 0, f"Período: {start_date} al {end_date}", title_format)
-        worksheet.write(2, 0, f"Generado: {datetime.now().strftime('%d/%m/%Y %H:%M')}", title_format)
-
-        time_cols = {
-            'Total Horas', 'Horas Regulares', 'Horas Extra 50%', 'Horas Extra 100%',
-            'Horas Nocturnas', 'Horas Feriado', 'Horas Feriado Nocturnas',
-            'Total Tardanzas', 'Total Retiros Anticipados',
-            'Horas Extra Diurnas', 'Horas Extra Nocturnas',
-            'Horas Extra 50% Nocturnas', 'Horas Extra 100% Nocturnas'
-        }
-
-        for col_num, col_name in enumerate(df.columns):
-            worksheet.write(3, col_num, col_name, header_format)
-            if col_name in time_cols:
-                if col_name == 'Horas Regulares':
-                    worksheet.set_column(col_num, col_num, 16, regular_format)
-                elif col_name == 'Horas Extra 50%':
-                    worksheet.set_column(col_num, col_num, 16, extra_50_format)
-                elif col_name == 'Horas Extra 100%':
-                    worksheet.set_column(col_num, col_num, 16, extra_100_format)
-                elif col_name in ['Horas Nocturnas', 'Horas Extra Nocturnas']:
-                    worksheet.set_column(col_num, col_num, 16, night_format)
-                elif col_name in ['Horas Feriado', 'Horas Feriado Nocturnas']:
-                    worksheet.set_column(col_num, col_num, 16, holiday_format)
-                else:
-                    worksheet.set_column(col_num, col_num, 16, time_format)
-            else:
-                worksheet.set_column(col_num, col_num, 18)
-
-    def _format_daily_sheet(self, writer, df, start_date, end_date):
-        workbook = writer.book
-        worksheet = writer.sheets['Detalle Diario']
+    def _get_formats(self) -> Dict:
+        """
+        Devuelve styles.xml y el formato (ancho, estilo) de las columnas de cada hoja.
+        Son constantes para el generador: se calculan en la primera llamada y se reutilizan.
+        """
+        if self._formats is None:
+            self._formats = {
+                'styles_xml': _STYLES_XML.format(num_format=self.num_format),
+                'summary': self._format_summary_sheet(SUMMARY_COLUMNS),
+                'daily': self._format_daily_sheet(DAILY_COLUMNS),
+            }
+        return self._formats
 
-        # Formato numérico según config
-        num_format = '0.00' if self.usar_decimales else 'hh:mm'
-
-        title_format = workbook.add_format({'bold': True, 'font_size': 12})
-        header_format = workbook.add_format({
-            'bold': True, 'font_color': 'white', 'bg_color': '#366092',
-            'border': 1, 'align': 'center', 'valign': 'vcenter'
-        })
-        time_format = workbook.add_format({'num_format': num_format})
-
-        worksheet.write(0, 0, "DETALLE DIARIO DE ASISTENCIA", title_format)
-        worksheet.write(1, 0, f"Período: {start_date} al {end_date}", title_format)
-        worksheet.write(2, 0, f"Generado: {datetime.now().strftime('%d/%m/%Y %H:%M')}", title_format)
-
-        time_cols = {
-            'Horas Trabajadas', 'Horas Regulares', 'Horas Extra 50%',
-            'Horas Extra 100%', 'Horas Nocturnas', 'Horas Feriado',
-            'Horas Feriado Nocturnas', 'Horas extra', 'Tardanza', 'Retiro Anticipado',
-            'Horas Extra Diurnas', 'Horas Extra Nocturnas',
-            'Horas Extra 50% Nocturnas', 'Horas Extra 100% Nocturnas'
-        }
-
-        for col_num, col_name in enumerate(df.columns):
-            worksheet.write(3, col_num, col_name, header_format)
-            if col_name in time_cols:
-                worksheet.set_column(col_num, col_num, 12, time_format)
-            elif col_name in ['Fecha', 'Nombre Feriado', 'Observaciones']: 
-                worksheet.set_column(col_num, col_num, 20)
-            elif col_name in ['Apellido, Nombre']:
-                worksheet.set_column(col_num, col_num, 28)
-            else:
-                worksheet.set_column(col_num, col_num, 14)
+    def _format_summary_sheet(self, columns: Sequence[str]) -> List[Tuple[int, int]]:
+        """Devuelve (ancho, índice de estilo) de cada columna de la hoja resumen"""
+        col_styles = self.SUMMARY_COL_STYLES
+        return [col_styles.get(col_name, (18, self.STYLE_DEFAULT)) for col_name in columns]
 
+    def _format_daily_sheet(self, columns: Sequence[str]) -> List[Tuple[int, int]]:
+        """Devuelve (ancho, índice de estilo) de cada columna de la hoja de detalle diario"""
+        col_styles = self.DAILY_COL_STYLES
+        return [col_styles.get(col_name, (14, self.STYLE_DEFAULT)) for col_name in columns]
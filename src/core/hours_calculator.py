@@ -3,37 +3,66 @@ Calculador de Horas según Normativa Argentina
 Incluye cálculo de Tardanza y Retiro Anticipado
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, List, Optional, Set, Tuple
 from zoneinfo import ZoneInfo  # stdlib (Python >=3.9)
 from config.default_config import DEFAULT_CONFIG
-import math
 import re
 
+# Hora HH:MM dentro de un texto (p.ej. "2025-01-15 08:55")
+_HHMM_RE = re.compile(r'([01]\d|2[0-3]):[0-5]\d')
+
+# Configuración leída una sola vez al importar (DEFAULT_CONFIG no cambia en ejecución)
+_CFG_JORNADA              = DEFAULT_CONFIG['jornada_completa_horas']
+_CFG_HORA_NOCTURNA_INICIO = DEFAULT_CONFIG['hora_nocturna_inicio']
+_CFG_HORA_NOCTURNA_FIN    = DEFAULT_CONFIG['hora_nocturna_fin']
+_CFG_SABADO_LIMITE        = DEFAULT_CONFIG.get('sabado_limite_hora', 13)
+_CFG_TOLERANCIA_MINUTOS   = DEFAULT_CONFIG['tolerancia_minutos']
+_CFG_FRAGMENTO_MINUTOS    = DEFAULT_CONFIG['fragmento_minutos']
+_CFG_HOLIDAY_NAMES        = DEFAULT_CONFIG.get('holiday_names', {})
+_CFG_EXTRAS_AL_50         = DEFAULT_CONFIG.get("extras_al_50", 2)  # p.ej. 4 en ARM
+_CFG_RESTAR_LLEGADA_ANTICIPADA = DEFAULT_CONFIG.get(
+    'restar_llegada_anticipada_de_horas_extras', True
+)
+# Flag general de redondeo: podés usar 'redondear_extras' o 'redondear'
+_CFG_REDONDEAR_EXTRAS     = DEFAULT_CONFIG.get(
+    'redondear_extras',
+    DEFAULT_CONFIG.get('redondear', False)
+)
+_LOCAL_TZ = ZoneInfo(
+    DEFAULT_CONFIG.get('local_timezone', 'America/Argentina/Buenos_Aires')
+)
+
+# Nombre del día según date.weekday() (0=Lun … 6=Dom)
+_DAYS_ES = ('Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo')
+
 class ArgentineHoursCalculator:
     """Calculador de horas según normativa laboral argentina"""
 
-    def __init__(self):
-        self.jornada_completa     = DEFAULT_CONFIG['jornada_completa_horas']
-        self.hora_nocturna_inicio = DEFAULT_CONFIG['hora_nocturna_inicio']  # se usa
-        self.hora_nocturna_fin    = DEFAULT_CONFIG['hora_nocturna_fin']     # se usa 
-        self.sabado_limite        = DEFAULT_CONFIG.get('sabado_limite_hora', 13)
-        self.tolerancia_minutos   = DEFAULT_CONFIG['tolerancia_minutos']
-        self.fragmento_minutos    = DEFAULT_CONFIG['fragmento_minutos']
-        self.holiday_names        = DEFAULT_CONFIG.get('holiday_names', {})
-        self.local_tz             = ZoneInfo(
-            DEFAULT_CONFIG.get('local_timezone', 'America/Argentina/Buenos_Aires')
-        )
-        self.extras_al_50         = DEFAULT_CONFIG.get("extras_al_50", 2)  # p.ej. 4 en ARM
-        self.restar_llegada_anticipada_de_horas_extras = DEFAULT_CONFIG.get(
-            'restar_llegada_anticipada_de_horas_extras', True
-        )
+    LIMITE_1300 = 13 * 60  # 13:00 en minutos (corte de extras del sábado)
 
-        # Flag general de redondeo: podés usar 'redondear_extras' o 'redondear'
-        self.redondear_extras = DEFAULT_CONFIG.get(
-            'redondear_extras',
-            DEFAULT_CONFIG.get('redondear', False)
-        )
+    def __init__(self):
+        self.jornada_completa     = _CFG_JORNADA
+        self.hora_nocturna_inicio = _CFG_HORA_NOCTURNA_INICIO  # se usa
+        self.hora_nocturna_fin    = _CFG_HORA_NOCTURNA_FIN     # se usa
+        self.sabado_limite        = _CFG_SABADO_LIMITE
+        self.tolerancia_minutos   = _CFG_TOLERANCIA_MINUTOS
+        self.fragmento_minutos    = _CFG_FRAGMENTO_MINUTOS
+        self.holiday_names        = _CFG_HOLIDAY_NAMES
+        self.local_tz             = _LOCAL_TZ
+        self.extras_al_50         = _CFG_EXTRAS_AL_50
+        self.restar_llegada_anticipada_de_horas_extras = _CFG_RESTAR_LLEGADA_ANTICIPADA
+        self.redondear_extras     = _CFG_REDONDEAR_EXTRAS
+
+        # Offset UTC→local por día UTC (ordinal). None = ese día hay cambio de offset.
+        self._offset_cache: Dict[int, Optional[timedelta]] = {}
+        # Sufijo ISO "±HH:MM" → delta a sumar para pasar a UTC
+        self._iso_suffix_cache: Dict[str, timedelta] = {}
+        # Día de referencia → (inicio, fin) de su ventana nocturna
+        self._night_window_cache: Dict[date, Tuple[datetime, datetime]] = {}
+        # ISO → datetime local (ver _parse_iso_to_local)
+        self._parse_iso_cached = lru_cache(maxsize=4096)(self._parse_iso_uncached)
 
     # -------------------- Helpers de parsing / fechas --------------------
 
@@ -53,7 +82,7 @@ class ArgentineHoursCalculator:
         if not horas or horas <= 0:
             return 0.0
 
-        minutos = int(round(horas * 60))
+        minutos = int(horas * 60 + 0.5)  # horas > 0: redondeo al minuto más cercano
         horas_enteras, resto = divmod(minutos, 60)
 
         # Usamos fragmento_minutos (por config, normalmente 30) como corte
@@ -87,52 +116,38 @@ class ArgentineHoursCalculator:
         if extra_day_hours <= 0:
             return 0.0, 0.0
 
-        try:
-            hs = self._only_hhmm(shift_start)
-            he = self._only_hhmm(shift_end)
-            if not he:
-                return 0.0, 0.0
-
-            if not hs:
-                hs = he  # fallback
-
-            # Pasar a minutos desde 00:00
-            h_ini, m_ini = map(int, hs.split(':'))
-            h_fin, m_fin = map(int, he.split(':'))
-            start_min = h_ini * 60 + m_ini
-            end_min = h_fin * 60 + m_fin
-
-            # Si el fin es <= inicio, asumimos cruce de medianoche
-            if end_min <= start_min:
-                end_min += 24 * 60
+        hs = self._only_hhmm(shift_start)
+        he = self._only_hhmm(shift_end)
+        if not he:
+            return 0.0, 0.0
 
-            # Duración del bloque de horas extra diurnas (en minutos)
-            extra_min = int(round(extra_day_hours * 60))
+        if not hs:
+            hs = he  # fallback
 
-            # Bloque de extra diurna al final de la jornada: [extra_start, end_min)
-            extra_start = end_min - extra_min
+        # Pasar a minutos desde 00:00 (_only_hhmm garantiza el formato HH:MM)
+        start_min = int(hs[:2]) * 60 + int(hs[3:])
+        end_min = int(he[:2]) * 60 + int(he[3:])
 
-            # Por seguridad, no permitir que el bloque extra arranque antes del inicio real
-            if extra_start < start_min:
-                extra_start = start_min
+        # Si el fin es <= inicio, asumimos cruce de medianoche
+        if end_min <= start_min:
+            end_min += 24 * 60
 
-            limite_1300 = 13 * 60  # 13:00 en minutos
+        # Duración del bloque de horas extra diurnas (en minutos)
+        extra_min = int(extra_day_hours * 60 + 0.5)  # extra_day_hours > 0
 
-            before_13_min = 0
-            after_13_min = 0
+        # Bloque de extra diurna al final de la jornada: [extra_start, end_min),
+        # sin permitir que arranque antes del inicio real
+        extra_start = max(end_min - extra_min, start_min)
 
-            # Parte del bloque extra ANTES de las 13:00 → [extra_start, min(end_min, limite_1300))
-            if extra_start < limite_1300:
-                before_13_min = max(0, min(end_min, limite_1300) - extra_start)
+        limite_1300 = self.LIMITE_1300
 
-            # Parte del bloque extra DESPUÉS de las 13:00 → [max(extra_start, limite_1300), end_min)
-            if end_min > limite_1300:
-                after_13_min = max(0, end_min - max(extra_start, limite_1300))
+        # Parte ANTES de las 13:00 → [extra_start, min(end_min, 13:00))
+        # Parte DESPUÉS de las 13:00 → [max(extra_start, 13:00), end_min)
+        # (si el tramo queda vacío, el max(0, ...) lo deja en 0)
+        before_13_min = max(0, min(end_min, limite_1300) - extra_start)
+        after_13_min = max(0, end_min - max(extra_start, limite_1300))
 
-            return before_13_min / 60.0, after_13_min / 60.0
-
-        except Exception:
-            return 0.0, 0.0
+        return before_13_min / 60.0, after_13_min / 60.0
 
     def redondear75(self, valor: float) -> float:
         """
@@ -144,8 +159,9 @@ class ArgentineHoursCalculator:
             8.50   -> 8.50
         """
         valor = round(valor, 2)  # normalizo a 2 decimales
-        if abs(valor % 1 - 0.75) < 1e-9:
-            return math.floor(valor) + 1
+        centesimos = int(round(valor * 100))
+        if centesimos % 100 == 75:
+            return centesimos // 100 + 1
         return valor
 
     #"referenceDate": "2025-10-23", 
@@ -157,30 +173,100 @@ class ArgentineHoursCalculator:
         """
         Convierte ISO (con 'Z' u offset) a datetime **local** (naive).
         Si no trae tz, se asume local.
+        Los resultados se cachean por string (los mismos fichajes se reprocesan
+        cada vez que se regenera un reporte del mismo período).
         """
         if not s:
             return None
+        return self._parse_iso_cached(s)
+
+    def _parse_iso_uncached(self, s: str) -> Optional[datetime]:
+        dt = self._parse_iso_fast(s)
+        if dt is not None:
+            return dt
         s = s.replace('Z', '+00:00')  # normalizo 'Z'
         try:
             dt = datetime.fromisoformat(s)
             if dt.tzinfo is None:
                 return dt  # ya está en local
-            return dt.astimezone(self.local_tz).replace(tzinfo=None)
-        except Exception:
+            utc = dt.replace(tzinfo=None) - dt.utcoffset()
+            off = self._local_offset(utc)
+            if off is None:
+                return dt.astimezone(self.local_tz).replace(tzinfo=None)
+            return utc + off
+        except (ValueError, TypeError, OverflowError):
+            return None
+
+    def _parse_iso_fast(self, s: str) -> Optional[datetime]:
+        """
+        Camino rápido de _parse_iso_to_local para las formas que manda la API:
+            ...SS[.fff]Z   ...SS[.fff]±HH:MM   y sin zona (local)
+        Parsea la parte naive con fromisoformat y aplica los offsets cacheados,
+        sin pasar por astimezone. Devuelve None si la forma no coincide
+        (el llamador usa el camino genérico).
+        """
+        try:
+            if s[-1] == 'Z':
+                dt = datetime.fromisoformat(s[:-1])
+                if dt.tzinfo is not None:
+                    return None
+            elif len(s) > 19 and s[-3] == ':' and s[-6] in '+-':
+                suffix = s[-6:]
+                tz_off = self._iso_suffix_cache.get(suffix)
+                if tz_off is None:
+                    tz_off = timedelta(hours=int(suffix[1:3]), minutes=int(suffix[4:6]))
+                    if suffix[0] == '+':
+                        tz_off = -tz_off
+                    self._iso_suffix_cache[suffix] = tz_off
+                dt = datetime.fromisoformat(s[:-6])
+                if dt.tzinfo is not None:
+                    return None
+                dt += tz_off  # → UTC naive
+            else:
+                dt = datetime.fromisoformat(s)
+                return dt if dt.tzinfo is None else None  # ya está en local
+
+            off = self._local_offset(dt)
+            return dt + off if off is not None else None
+        except (ValueError, OverflowError):
             return None
 
+    def _local_offset(self, utc: datetime) -> Optional[timedelta]:
+        """
+        Offset de local_tz para el instante UTC (naive) dado, cacheado por día UTC.
+        Si ese día la zona cambia de offset (p.ej. horario de verano) devuelve None
+        y el llamador resuelve con astimezone.
+        """
+        key = utc.toordinal()
+        if key in self._offset_cache:
+            return self._offset_cache[key]
+        day_start = datetime(utc.year, utc.month, utc.day, tzinfo=timezone.utc)
+        day_end = day_start + timedelta(days=1, microseconds=-1)
+        off = day_start.astimezone(self.local_tz).utcoffset()
+        if day_end.astimezone(self.local_tz).utcoffset() != off:
+            off = None
+        self._offset_cache[key] = off
+        return off
+
     # toma los fichajes REALES y los formatea a hora local y los acomoda 
     def _first_entry_pair_local(self, day_summary: Dict) -> Tuple[Optional[datetime], Optional[datetime]]:
         """
         Toma el primer START y el primer END de entries, los convierte a **local** y
         devuelve (start_local, end_local). Maneja cruce de día si end <= start.
         """
+        entries = day_summary.get('entries')
+        if not entries:
+            return None, None
+
         start_iso = end_iso = None
-        for e in (day_summary.get('entries') or []):
-            if e.get('type') == 'START' and not start_iso:
+        for e in entries:
+            etype = e.get('type')
+            if etype == 'START' and not start_iso:
                 start_iso = e.get('time') or e.get('date')
-            elif e.get('type') == 'END' and not end_iso:
+            elif etype == 'END' and not end_iso:
                 end_iso = e.get('time') or e.get('date')
+            if start_iso and end_iso:
+                break  # ya tengo el primer par
 
         s_dt = self._parse_iso_to_local(start_iso[:25] if start_iso else None)
         e_dt = self._parse_iso_to_local(end_iso[:25] if end_iso else None)
@@ -188,13 +274,13 @@ class ArgentineHoursCalculator:
             e_dt += timedelta(days=1)  # cruza medianoche
         return s_dt, e_dt
 
-    def _display_from_entries(self, day_summary: Dict) -> Tuple[str, str, str, str]:
+    def _display_from_entries(self, ref_str: str, s_dt: Optional[datetime],
+                              e_dt: Optional[datetime]) -> Tuple[str, str, str, str]:
         """
-        Devuelve (start_date, start_hhmm, end_date, end_hhmm) usando ENTRIES en local.
+        Devuelve (start_date, start_hhmm, end_date, end_hhmm) a partir del par
+        local (s_dt, e_dt) ya obtenido de ENTRIES.
         Si faltan, devuelve strings vacíos anclados al ref_str.
         """
-        ref_str = self._get_ref_str(day_summary)
-        s_dt, e_dt = self._first_entry_pair_local(day_summary)
         if not (s_dt and e_dt):
             return ref_str, "", ref_str, ""
         return (
@@ -204,12 +290,12 @@ class ArgentineHoursCalculator:
             e_dt.strftime("%H:%M"),
         )
 
-    def _get_intervals_from_entries(self, day_summary: Dict) -> List[Tuple[datetime, datetime]]:
+    def _get_intervals_from_entries(self, s_dt: Optional[datetime],
+                                    e_dt: Optional[datetime]) -> List[Tuple[datetime, datetime]]:
         """
-        Devuelve [(start_local, end_local)] usando entries.
+        Devuelve [(start_local, end_local)] a partir del par local de entries.
         (Si quisieras soportar varios pares START/END, expandí acá).
         """
-        s_dt, e_dt = self._first_entry_pair_local(day_summary)
         return [(s_dt, e_dt)] if (s_dt and e_dt) else []
 
     def _get_holiday_name(self, date_str: str, day_summary: Dict) -> Optional[str]:
@@ -230,27 +316,39 @@ class ArgentineHoursCalculator:
         return max(0.0, (end - start).total_seconds() / 3600)
 
     def _compute_night_hours_from_intervals(self, intervals: List[Tuple[datetime, datetime]],
-                                            ref_dt: datetime) -> float:
+                                            ref_dt: date) -> float:
         """
         Ventana nocturna anclada al **día de inicio** (ref_dt): 21:00 → 06:00 del día siguiente.
         """
-        n_start = ref_dt.replace(hour=self.hora_nocturna_inicio, minute=0, second=0, microsecond=0)
-        n_end   = (ref_dt + timedelta(days=1)).replace(hour=self.hora_nocturna_fin, minute=0, second=0, microsecond=0)
+        window = self._night_window_cache.get(ref_dt)
+        if window is None:
+            n_start = datetime(ref_dt.year, ref_dt.month, ref_dt.day, self.hora_nocturna_inicio)
+            n_end   = n_start + timedelta(hours=24 + self.hora_nocturna_fin - self.hora_nocturna_inicio)
+            window = self._night_window_cache[ref_dt] = (n_start, n_end)
+        n_start, n_end = window
         total = 0.0
         for s_dt, e_dt in intervals:
-            total += self._intersect_hours(s_dt, e_dt, n_start, n_end)
+            # Intersección con la ventana (mismo cálculo que _intersect_hours)
+            start = s_dt if s_dt > n_start else n_start
+            end = e_dt if e_dt < n_end else n_end
+            seconds = (end - start).total_seconds()
+            if seconds > 0:
+                total += seconds / 3600
         return round(total, 2)
 
     # -------------------- Feriado por FIN local --------------------
 
     def _crosses_into_holiday_local_end(self, day_summary: Dict,
                                         ref_str: str,
-                                        holiday_dates: Set[str]) -> Optional[str]:
+                                        holiday_dates: Set[str],
+                                        pair: Optional[Tuple[Optional[datetime], Optional[datetime]]] = None
+                                        ) -> Optional[str]:
         """
         Si el END (en hora LOCAL) cae en un día distinto y ese día es feriado,
         devuelve esa fecha (YYYY-MM-DD). Si no, None.
+        pair: (start_local, end_local) ya calculado con _first_entry_pair_local, si lo hay.
         """
-        _, e_dt = self._first_entry_pair_local(day_summary)
+        _, e_dt = pair if pair is not None else self._first_entry_pair_local(day_summary)
         if not e_dt:
             return None
         end_date_local = e_dt.strftime("%Y-%m-%d")
@@ -290,134 +388,61 @@ class ArgentineHoursCalculator:
         """Devuelve 'HH:MM' si lo encuentra dentro de value; si no, ''."""
         if not value:
             return ""
-        m = re.search(r'([01]\d|2[0-3]):[0-5]\d', str(value))
+        s = value if isinstance(value, str) else str(value)
+
+        # Camino rápido: "YYYY-MM-DD HH:MM" (formato que arma _display_from_entries)
+        if len(s) >= 16 and s[10] == ' ' and s[13] == ':' and s[4] == '-' and s[7] == '-':
+            h1, h2, m1, m2 = s[11], s[12], s[14], s[15]
+            if ((('0' <= h1 <= '1' and '0' <= h2 <= '9') or (h1 == '2' and '0' <= h2 <= '3'))
+                    and '0' <= m1 <= '5' and '0' <= m2 <= '9'):
+                return s[11:16]
+
+        m = _HHMM_RE.search(s)
         return m.group(0) if m else ""
 
-    def _calcular_tardanza_minutos(self, time_range: str, shift_start: str) -> float:
+    def _hhmm_a_minutos(self, hhmm: str) -> Optional[int]:
+        """'08:30' → 510. None si no tiene la forma H:M."""
+        try:
+            h, m = map(int, hhmm.split(':'))
+        except ValueError:
+            return None
+        return h * 60 + m
+
+    def _calcular_tardanza_minutos(self, tr_start_min: Optional[int], real_start_min: int) -> int:
         """
         Calcula la tardanza en minutos.
-        time_range: "08:30 - 17:15"
-        shift_start: "2025-01-15 08:55" (puede incluir fecha completa)
-        Retorna: minutos de tardanza (0 si llegó a tiempo o antes)
+        tr_start_min: inicio del horario obligatorio, en minutos desde 00:00 (08:30 → 510)
+        real_start_min: hora real de fichada de entrada, en minutos desde 00:00
+        Retorna: minutos de tardanza (0 si llegó a tiempo o antes, o si no hay horario)
         """
-        if not time_range or not shift_start:
-            return 0.0
-        
-        try:
-            # Extraer hora de inicio del horario obligatorio
-            hora_obligatoria = time_range.split('-')[0].strip()
-            h_oblig, m_oblig = map(int, hora_obligatoria.split(':'))
-            
-            # Extraer hora real de fichada
-            hora_real = self._only_hhmm(shift_start)
-            if not hora_real:
-                return 0.0
-            h_real, m_real = map(int, hora_real.split(':'))
-            
-            # Convertir a minutos totales
-            minutos_obligatorio = h_oblig * 60 + m_oblig
-            minutos_real = h_real * 60 + m_real
-            
-            # Calcular tardanza en minutos
-            tardanza_mins = minutos_real - minutos_obligatorio
-            return max(0.0, float(tardanza_mins))
-            
-        except Exception:
-            return 0.0
+        if tr_start_min is None:
+            return 0
+        return max(0, real_start_min - tr_start_min)
 
-    def _calcular_llegada_anticipada_minutos(self, time_range: str, shift_start: str) -> float:
+    def _calcular_llegada_anticipada_minutos(self, tr_start_min: Optional[int], real_start_min: int) -> int:
         """
         Calcula la llegada anticipada en minutos.
-        time_range: "09:00 - 17:00"
-        shift_start: "2025-01-15 08:40" (puede incluir fecha completa)
-        Retorna: minutos de llegada anticipada (0 si llegó a tiempo o después).
+        tr_start_min: inicio del horario obligatorio, en minutos desde 00:00 (09:00 → 540)
+        real_start_min: hora real de fichada de entrada, en minutos desde 00:00
+        Retorna: minutos de llegada anticipada (0 si llegó a tiempo o después, o si no hay horario)
         """
-        if not time_range or not shift_start:
-            return 0.0
+        if tr_start_min is None:
+            return 0
+        return max(0, tr_start_min - real_start_min)
 
-        try:
-            # Hora de inicio obligatoria
-            hora_obligatoria = time_range.split('-')[0].strip()
-            h_oblig, m_oblig = map(int, hora_obligatoria.split(':'))
-
-            # Hora real de fichada (solo HH:MM)
-            hora_real = self._only_hhmm(shift_start)
-            if not hora_real:
-                return 0.0
-            h_real, m_real = map(int, hora_real.split(':'))
-
-            # Minutos totales
-            minutos_obligatorio = h_oblig * 60 + m_oblig
-            minutos_real = h_real * 60 + m_real
-
-            # Si llegó antes, la diferencia es positiva
-            anticipado_mins = minutos_obligatorio - minutos_real
-            return max(0.0, float(anticipado_mins))
-
-        except Exception:
-            return 0.0
-
-    def _calcular_retiro_anticipado_minutos(self, time_range: str,
-                                            shift_start: str,
-                                            shift_end: str) -> float:
+    def _calcular_retiro_anticipado_minutos(self, tr_end_min: Optional[int], real_end_min: int,
+                                            crosses_midnight: bool) -> int:
         """
         Calcula el retiro anticipado en minutos.
-        Maneja correctamente turnos nocturnos que cruzan medianoche.
-        
-        time_range: "08:00 - 16:45"
-        shift_start: "2025-01-15 07:45" 
-        shift_end: "2025-01-16 03:45" (puede ser del día siguiente)
-        Retorna: minutos de retiro anticipado (0 si se fue a tiempo o después)
-        """
-        if not time_range or not shift_end:
-            return 0.0
-        
-        try:
-            # Extraer hora de fin del horario obligatorio
-            hora_obligatoria = time_range.split('-')[1].strip()
-            h_oblig, m_oblig = map(int, hora_obligatoria.split(':'))
-            
-            # Extraer fechas y horas de las fichadas
-            hora_start = self._only_hhmm(shift_start) if shift_start else None
-            hora_end = self._only_hhmm(shift_end)
-            
-            if not hora_end:
-                return 0.0
-            
-            # Extraer fechas completas si existen
-            fecha_start = None
-            fecha_end = None
-            
-            if shift_start and len(shift_start) >= 10:
-                try:
-                    fecha_start = datetime.strptime(shift_start[:10], '%Y-%m-%d').date()
-                except:
-                    pass
-                    
-            if shift_end and len(shift_end) >= 10:
-                try:
-                    fecha_end = datetime.strptime(shift_end[:10], '%Y-%m-%d').date()
-                except:
-                    pass
-            
-            # CASO 1: Si hay fechas y son diferentes (turno nocturno que cruza medianoche)
-            # NO calcular retiro anticipado porque es un turno nocturno válido
-            if fecha_start and fecha_end and fecha_end > fecha_start:
-                return 0.0
-            
-            # CASO 2: Mismo día o sin información de fecha - calcular normalmente
-            h_end, m_end = map(int, hora_end.split(':'))
-            
-            minutos_obligatorio = h_oblig * 60 + m_oblig
-            minutos_real = h_end * 60 + m_end
-            
-            # Calcular retiro anticipado en minutos
-            retiro_mins = minutos_obligatorio - minutos_real
-            return max(0.0, float(retiro_mins))
-            
-        except Exception:
-            return 0.0
-    
+        tr_end_min: fin del horario obligatorio, en minutos desde 00:00 (16:45 → 1005)
+        real_end_min: hora real de fichada de salida, en minutos desde 00:00
+        crosses_midnight: la salida es de un día posterior a la entrada (turno nocturno)
+        Retorna: minutos de retiro anticipado (0 si se fue a tiempo o después, o si no hay horario)
+        """
+        # Turno nocturno que cruza medianoche → no hay retiro anticipado
+        if tr_end_min is None or crosses_midnight:
+            return 0
+        return max(0, tr_end_min - real_end_min)
 
     def _minutos_a_horas(self, minutos: float) -> float:
         """Convierte minutos a horas decimales SIN recortar minutos."""
@@ -434,36 +459,60 @@ class ArgentineHoursCalculator:
                               employee_info: Dict,
                               previous_pending_hours: float = 0,
                               holidays: Optional[Set[str]] = None) -> Dict:
+        """
+        Procesa los day_summaries de un empleado y devuelve sus filas diarias y totales.
+        Los feriados salen de day_summary['holidays'] (API); holidays no se usa en el cálculo.
+        """
 
         daily_data: List[Dict] = []
-        totals = {
-            'total_days_worked': 0.0,
-            'total_hours_worked': 0.0,
-            'total_regular_hours': 0.0,
-            'total_extra_hours_50': 0.0,
-            'total_extra_hours_100': 0.0,
-            'total_night_hours': 0.0,
-            'total_holiday_hours': 0.0,
-            'total_pending_hours': float(previous_pending_hours),
-            'total_tardanza_horas': 0.0,
-            'total_retiro_anticipado_horas': 0.0,
-            'total_extra_day_hours': 0.0,
-            'total_extra_night_hours': 0.0,
-            'total_extra_night_hours_50': 0.0,
-            'total_extra_night_hours_100': 0.0,
-            'total_holiday_night_hours': 0.0,
-        }
 
-        holidays = holidays or set()
+        # Totales como variables locales; el dict se arma una sola vez al final
+        tot_days_worked           = 0.0
+        tot_hours_worked          = 0.0
+        tot_regular_hours         = 0.0
+        tot_extra_hours_50        = 0.0
+        tot_extra_hours_100       = 0.0
+        tot_night_hours           = 0.0
+        tot_holiday_hours         = 0.0
+        tot_pending_hours         = float(previous_pending_hours)
+        tot_tardanza_mins         = 0   # enteros: suma exacta, se pasa a horas al final
+        tot_retiro_mins           = 0
+        tot_extra_day_hours       = 0.0
+        tot_extra_night_hours     = 0.0
+        tot_extra_night_hours_50  = 0.0
+        tot_extra_night_hours_100 = 0.0
+        tot_holiday_night_hours   = 0.0
+
+        # Redondeo a media hora: se resuelve una vez, no en cada llamada del loop
+        redondear = self.redondear_extras
+        redondear_media_hora = self.redondear_extras_a_media_hora
+
+        # Métodos y config usados en cada día, ligados a variables locales
+        first_entry_pair_local      = self._first_entry_pair_local
+        display_from_entries        = self._display_from_entries
+        hhmm_a_minutos              = self._hhmm_a_minutos
+        calcular_tardanza           = self._calcular_tardanza_minutos
+        calcular_llegada_anticipada = self._calcular_llegada_anticipada_minutos
+        calcular_retiro_anticipado  = self._calcular_retiro_anticipado_minutos
+        holiday_names               = self.holiday_names
+        get_intervals_from_entries  = self._get_intervals_from_entries
+        compute_night_hours         = self._compute_night_hours_from_intervals
+        split_extra_at_13           = self._split_extra_day_hours_at_13
+        jornada_completa            = self.jornada_completa
+        restar_llegada_anticipada   = self.restar_llegada_anticipada_de_horas_extras
+        employee_id                 = employee_info.get('employeeInternalId')
+        daily_append                = daily_data.append
 
         for day_summary in day_summaries:
-            is_holiday_api = bool(day_summary.get('holidays'))
-            has_time_off   = bool(day_summary.get('timeOffRequests'))
-            has_absence    = 'ABSENT' in (day_summary.get('incidences') or [])
-            is_rest_day    = not bool(day_summary.get('isWorkday', True))  # FRANCO
-            is_workday     = bool(day_summary.get('isWorkday', True))      # Día laboral   
-            slots = day_summary.get('timeSlots') or []
-            
+            ds_get = day_summary.get
+            api_holidays   = ds_get('holidays')
+            is_holiday_api = bool(api_holidays)
+            time_off_reqs  = ds_get('timeOffRequests')
+            has_time_off   = bool(time_off_reqs)
+            has_absence    = 'ABSENT' in (ds_get('incidences') or ())
+            is_rest_day    = not ds_get('isWorkday', True)  # FRANCO
+            slots = ds_get('timeSlots') or ()
+            entries = ds_get('entries')
 
             if (
                 is_rest_day and              # es franco / domingo
@@ -471,67 +520,98 @@ class ArgentineHoursCalculator:
                 not has_time_off and         # sin licencia
                 not has_absence and          # sin ausencia cargada
                 not slots and                # sin horario obligatorio
-                not (day_summary.get('entries') or [])  # sin fichadas
+                not entries                  # sin fichadas
             ):
                 continue
 
-            time_range = (
-                f"{slots[0]['startTime']} - {slots[0]['endTime']}"
-                if slots and slots[0].get('startTime') and slots[0].get('endTime')
-                else None
-            )
-
-            ref_str = self._get_ref_str(day_summary)
+            # Horario obligatorio en minutos desde 00:00; time_range queda sólo para la salida
+            time_range = oblig_inicio_min = oblig_fin_min = None
+            if slots:
+                slot_inicio = slots[0].get('startTime')
+                slot_fin = slots[0].get('endTime')
+                if slot_inicio and slot_fin:
+                    time_range = f"{slot_inicio} - {slot_fin}"
+                    oblig_inicio_min = hhmm_a_minutos(slot_inicio.strip())
+                    oblig_fin_min = hhmm_a_minutos(slot_fin.strip())
+
+            # Igual que _get_ref_str
+            ref_str = (ds_get('referenceDate') or ds_get('date') or '')[:10]
             if not ref_str:
                 continue
 
-            ref_dt = datetime.strptime(ref_str, '%Y-%m-%d')
-            dow = ref_dt.weekday()  # 0=Lun … 6=Dom
+            ref_date = date.fromisoformat(ref_str)
+            dow = ref_date.weekday()  # 0=Lun … 6=Dom
 
+            hours_dict = ds_get('hours')
             hours_worked = float(
-                day_summary.get('hours', {}).get('worked', 0)
-                or day_summary.get('totalHours', 0)
+                (hours_dict.get('worked', 0) if hours_dict else 0)
+                or ds_get('totalHours', 0)
                 or 0
             )
 
+            # ---- Par START/END local (se parsea una sola vez por día) ----
+            if entries:
+                s_dt, e_dt = first_entry_pair_local(day_summary)
+            else:
+                s_dt = e_dt = None  # sin fichadas: nada que parsear
+
             # ---- Horarios de turno para display ----
-            disp_start_d, disp_start_h, disp_end_d, disp_end_h = self._display_from_entries(day_summary)
-            shift_start = " ".join([disp_start_d, disp_start_h]).strip()
-            shift_end   = " ".join([disp_end_d, disp_end_h]).strip()
+            disp_start_d, disp_start_h, disp_end_d, disp_end_h = display_from_entries(ref_str, s_dt, e_dt)
+            if disp_start_h:
+                shift_start = disp_start_d + " " + disp_start_h
+                shift_end   = disp_end_d + " " + disp_end_h
+            else:
+                # Sin fichadas: solo la fecha de referencia
+                shift_start = disp_start_d
+                shift_end   = disp_end_d
 
             # ===== CALCULAR TARDANZA Y RETIRO ANTICIPADO =====
-            tardanza_mins            = self._calcular_tardanza_minutos(time_range, shift_start)
-            retiro_mins              = self._calcular_retiro_anticipado_minutos(time_range, shift_start, shift_end)
-            llegada_anticipada_mins  = self._calcular_llegada_anticipada_minutos(time_range, shift_start)
+            # Horario y fichadas en minutos desde 00:00, parseados una sola vez
+            tardanza_mins = retiro_mins = llegada_anticipada_mins = 0
 
-            tardanza_horas           = self._minutos_a_horas(tardanza_mins)
-            retiro_horas             = self._minutos_a_horas(retiro_mins)
-            llegada_anticipada_horas = self._minutos_a_horas(llegada_anticipada_mins)
+            if disp_start_h:  # hay par START/END
+                real_inicio_min = int(disp_start_h[:2]) * 60 + int(disp_start_h[3:])
+                real_fin_min = int(disp_end_h[:2]) * 60 + int(disp_end_h[3:])
+                tardanza_mins = calcular_tardanza(oblig_inicio_min, real_inicio_min)
+                llegada_anticipada_mins = calcular_llegada_anticipada(oblig_inicio_min, real_inicio_min)
+                # Fechas 'YYYY-MM-DD': el orden de los strings es el de las fechas
+                retiro_mins = calcular_retiro_anticipado(oblig_fin_min, real_fin_min,
+                                                         disp_end_d > disp_start_d)
+
+            tardanza_horas           = tardanza_mins / 60.0
+            retiro_horas             = retiro_mins / 60.0
 
             # ===== USAR HORAS CATEGORIZADAS DE LA API =====
-            categorized_hours = day_summary.get('categorizedHours', [])
+            categorized_hours = ds_get('categorizedHours') or ()
             regular_hours = 0.0
             extra_hours   = 0.0
             
             for cat_hour in categorized_hours:
-                category_name = cat_hour.get('category', {}).get('name', '').upper()
-                hours = float(cat_hour.get('hours', 0))
-                
+                category = cat_hour.get('category')
+                category_name = category.get('name') if category else None
+                if not category_name:
+                    continue
+                category_name = category_name.upper()
+
                 if category_name == 'REGULAR':
-                    regular_hours += hours
+                    regular_hours += float(cat_hour.get('hours', 0))
                 elif category_name == 'EXTRA':
-                    extra_hours += hours
+                    extra_hours += float(cat_hour.get('hours', 0))
 
             # Aplico redondeo (si está activado) a las horas extra totales antes de otros ajustes
-            extra_hours = self._maybe_redondear_extras(extra_hours)
+            if redondear:
+                extra_hours = redondear_media_hora(extra_hours)
             
-            if self.restar_llegada_anticipada_de_horas_extras:
-                extra_mins = self._horas_a_minutos(extra_hours)               
-                extra_mins = max(0, extra_mins - int(llegada_anticipada_mins))  
+            if restar_llegada_anticipada:
+                extra_mins = int(round(extra_hours * 60))
+                extra_mins = max(0, extra_mins - llegada_anticipada_mins)  
                 extra_hours = extra_mins / 60.0             
             
             # Vuelvo a aplicar redondeo tras descontar llegada anticipada
-            extra_hours = self._maybe_redondear_extras(extra_hours)
+            if redondear:
+                extra_hours = redondear_media_hora(extra_hours)
+
+            time_off_name = time_off_reqs[0].get('name') if has_time_off else None
 
             # ¿A qué fecha imputo?
             out_date_str = ref_str
@@ -540,11 +620,11 @@ class ArgentineHoursCalculator:
             is_holiday_output = is_holiday_api
             holiday_name = None
             if is_holiday_output:
-                holiday_name = self._get_holiday_name(out_date_str, day_summary) or \
-                               self._get_holiday_name(ref_str, day_summary)
+                # Igual que _get_holiday_name: primero el nombre de la API, si no el del config
+                holiday_name = (api_holidays[0] or {}).get('name') or holiday_names.get(out_date_str)
 
-            intervals = self._get_intervals_from_entries(day_summary)
-            night_hours = self._compute_night_hours_from_intervals(intervals, ref_dt) \
+            intervals = get_intervals_from_entries(s_dt, e_dt)
+            night_hours = compute_night_hours(intervals, ref_date) \
                           if intervals else 0.0
 
             # ---- Cálculo de horas feriado ----
@@ -552,8 +632,8 @@ class ArgentineHoursCalculator:
             holiday_night_hours = 0.0  # horas feriado nocturnas
 
             if is_holiday_output and intervals:
-                # Total nocturnas en ese feriado (ventana nocturna config)
-                holiday_night_hours = self._compute_night_hours_from_intervals(intervals, ref_dt)
+                # Total nocturnas en ese feriado (misma ventana nocturna ya calculada)
+                holiday_night_hours = night_hours
 
                 # El resto del tiempo trabajado en feriado son las diurnas
                 total_hours_holiday = hours_worked
@@ -562,7 +642,7 @@ class ArgentineHoursCalculator:
             # Calcular horas pendientes
             pending = 0.0
             if not has_time_off and not has_absence and regular_hours > 0:
-                expected_regular = self.jornada_completa
+                expected_regular = jornada_completa
                 if regular_hours < expected_regular:
                     pending = expected_regular - regular_hours
 
@@ -583,7 +663,7 @@ class ArgentineHoursCalculator:
                 extra_night_hours_100 += extra_night_hours
 
                 # Diurnas del sábado: separar antes / después de las 13
-                extra_before_13, extra_after_13 = self._split_extra_day_hours_at_13(
+                extra_before_13, extra_after_13 = split_extra_at_13(
                     shift_start, shift_end, extra_day_hours
                 )
                 # Antes de las 13 → 50%
@@ -608,42 +688,41 @@ class ArgentineHoursCalculator:
 
 
             # === Redondeo final de extras / nocturnas / feriados (si está activado) ===
-            extra_day_hours        = self._maybe_redondear_extras(extra_day_hours)
-            extra_night_hours      = self._maybe_redondear_extras(extra_night_hours)
-            extra_night_hours_50   = self._maybe_redondear_extras(extra_night_hours_50)
-            extra_night_hours_100  = self._maybe_redondear_extras(extra_night_hours_100)
-            extra50                = self._maybe_redondear_extras(extra50)
-            extra100               = self._maybe_redondear_extras(extra100)
-            night_hours            = self._maybe_redondear_extras(night_hours)
-            holiday_hours          = self._maybe_redondear_extras(holiday_hours)
-            holiday_night_hours    = self._maybe_redondear_extras(holiday_night_hours)
+            if redondear:
+                extra_day_hours        = redondear_media_hora(extra_day_hours)
+                extra_night_hours      = redondear_media_hora(extra_night_hours)
+                extra_night_hours_50   = redondear_media_hora(extra_night_hours_50)
+                extra_night_hours_100  = redondear_media_hora(extra_night_hours_100)
+                extra50                = redondear_media_hora(extra50)
+                extra100               = redondear_media_hora(extra100)
+                night_hours            = redondear_media_hora(night_hours)
+                holiday_hours          = redondear_media_hora(holiday_hours)
+                holiday_night_hours    = redondear_media_hora(holiday_night_hours)
 
             # ---------------- Acumulo totales ----------------
-            totals['total_days_worked']           += 1
-            totals['total_hours_worked']          += hours_worked
-            totals['total_regular_hours']         += regular_hours 
-            totals['total_extra_hours_50']        += extra50
-            totals['total_extra_hours_100']       += extra100
-            totals['total_night_hours']           += night_hours
-            totals['total_holiday_hours']         += holiday_hours
-            totals['total_tardanza_horas']        += tardanza_horas
-            totals['total_retiro_anticipado_horas'] += retiro_horas
-            totals['total_extra_day_hours']       += extra_day_hours
-            totals['total_extra_night_hours']     += extra_night_hours
-            totals['total_extra_night_hours_50']  += extra_night_hours_50
-            totals['total_extra_night_hours_100'] += extra_night_hours_100
-            totals['total_holiday_night_hours']   += holiday_night_hours
+            tot_days_worked           += 1
+            tot_hours_worked          += hours_worked
+            tot_regular_hours         += regular_hours
+            tot_extra_hours_50        += extra50
+            tot_extra_hours_100       += extra100
+            tot_night_hours           += night_hours
+            tot_holiday_hours         += holiday_hours
+            tot_tardanza_mins         += tardanza_mins
+            tot_retiro_mins           += retiro_mins
+            tot_extra_day_hours       += extra_day_hours
+            tot_extra_night_hours     += extra_night_hours
+            tot_extra_night_hours_50  += extra_night_hours_50
+            tot_extra_night_hours_100 += extra_night_hours_100
+            tot_holiday_night_hours   += holiday_night_hours
 
             if not has_time_off and not has_absence:
-                totals['total_pending_hours'] += pending
+                tot_pending_hours += pending
 
             # Agregar entrada diaria
-            daily_data.append({
-                'employee_id': employee_info.get('employeeInternalId'),
+            daily_append({
+                'employee_id': employee_id,
                 'date': out_date_str,
-                'day_of_week': self.get_day_of_week_spanish(
-                    datetime.strptime(out_date_str, '%Y-%m-%d')
-                ),
+                'day_of_week': _DAYS_ES[dow],
                 'hours_worked': hours_worked,
                 'regular_hours': regular_hours,
                 'extra_hours': extra_hours,
@@ -659,10 +738,7 @@ class ArgentineHoursCalculator:
                 'holiday_name': holiday_name,
                 'is_rest_day': bool(is_rest_day),
                 'has_time_off': has_time_off,
-                'time_off_name': (
-                    (day_summary.get('timeOffRequests') or [{}])[0].get('name')
-                    if has_time_off else None
-                ),
+                'time_off_name': time_off_name,
                 'has_absence': has_absence,
                 'is_full_time': hours_worked >= regular_hours,
                 'shift_start': shift_start,
@@ -675,6 +751,24 @@ class ArgentineHoursCalculator:
                 'holiday_night_hours': holiday_night_hours,
             })
 
+        totals = {
+            'total_days_worked': tot_days_worked,
+            'total_hours_worked': tot_hours_worked,
+            'total_regular_hours': tot_regular_hours,
+            'total_extra_hours_50': tot_extra_hours_50,
+            'total_extra_hours_100': tot_extra_hours_100,
+            'total_night_hours': tot_night_hours,
+            'total_holiday_hours': tot_holiday_hours,
+            'total_pending_hours': tot_pending_hours,
+            'total_tardanza_horas': tot_tardanza_mins / 60.0,
+            'total_retiro_anticipado_horas': tot_retiro_mins / 60.0,
+            'total_extra_day_hours': tot_extra_day_hours,
+            'total_extra_night_hours': tot_extra_night_hours,
+            'total_extra_night_hours_50': tot_extra_night_hours_50,
+            'total_extra_night_hours_100': tot_extra_night_hours_100,
+            'total_holiday_night_hours': tot_holiday_night_hours,
+        }
+
         return {
             'employee_info': employee_info,
             'daily_data': daily_data,
@@ -684,8 +778,7 @@ class ArgentineHoursCalculator:
     # -------------------- Otras utilidades --------------------
 
     def get_day_of_week_spanish(self, date: datetime) -> str:
-        days = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
-        return days[date.weekday()]
+        return _DAYS_ES[date.weekday()]
 
     def is_night_hour(self, hour: int) -> bool:
         return hour >= self.hora_nocturna_inicio or hour < self.hora_nocturna_fin
@@ -716,4 +809,4 @@ def process_employee_data_from_day_summaries(
     holidays: Optional[Set[str]] = None
 ) -> Dict:
     calc = ArgentineHoursCalculator()
-    return calc.process_employee_data(day_summaries, employee_info, previous_pending_hours, holidays or set())
+    return calc.process_employee_data(day_summaries, employee_info, previous_pending_hours, holidays)